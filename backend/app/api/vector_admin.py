@@ -337,20 +337,20 @@ async def test_vector_serialization() -> Dict[str, Any]:
             "current_method": {
                 "serialized_length": len(serialized),
                 "serialized_hex": serialized.hex(),
-                "deserialized": deserialized,
-                "round_trip_success": np.allclose(deserialized, test_vector)
+                "deserialized": deserialized.tolist(),
+                "round_trip_success": bool(np.allclose(deserialized, test_vector))
             },
             "old_format_compatibility": {
                 "serialized_length": len(old_bytes),
                 "serialized_hex": old_bytes.hex(),
-                "deserialized": old_deserialized,
-                "compatibility_success": old_deserialized == test_vector
+                "deserialized": old_deserialized.tolist(),
+                "compatibility_success": bool(np.allclose(old_deserialized, test_vector))
             },
             "new_format_compatibility": {
                 "serialized_length": len(new_bytes),
                 "serialized_hex": new_bytes.hex(),
-                "deserialized": new_deserialized,
-                "compatibility_success": np.allclose(new_deserialized, test_vector)
+                "deserialized": new_deserialized.tolist(),
+                "compatibility_success": bool(np.allclose(new_deserialized, test_vector))
             }
         }
         
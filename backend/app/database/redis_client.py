@@ -1,4 +1,5 @@
 import redis
+import redis.asyncio
 import ssl
 import socket
 import json
@@ -22,6 +23,8 @@ class RedisClient:
         if not RedisClient._initialized:
             self.client: Optional[redis.Redis] = None
             self._connected = False
+            self._connection_args = None
+            self._async_client: Optional[redis.asyncio.Redis] = None
             RedisClient._initialized = True
     
     def connect(self):
@@ -36,8 +39,7 @@ class RedisClient:
             logger.info(f"Connecting to Redis Cloud at {settings.redis_host}:{settings.redis_port}")
             
             # Connect using redis.from_url for Redis Cloud compatibility
-            self.client = redis.from_url(
-                redis_url,
+            options = dict(
                 decode_responses=True,
                 socket_connect_timeout=30,
                 socket_timeout=30,
@@ -45,10 +47,12 @@ class RedisClient:
                 health_check_interval=30,
                 max_connections=20
             )
+            self.client = redis.from_url(redis_url, **options)
             
             # Test connection
             self.client.ping()
             self._connected = True
+            self._connection_args = (redis_url, options)
             logger.info(f"✅ Redis connected successfully to {settings.redis_host}:{settings.redis_port}")
             return
             
@@ -65,17 +69,19 @@ class RedisClient:
             
             logger.info("Attempting fallback Redis connection with SSL...")
             
-            self.client = redis.from_url(
-                redis_url,
+            options = dict(
                 ssl_cert_reqs=None,
                 ssl_check_hostname=False,
                 decode_responses=True,
                 socket_connect_timeout=30,
-                socket_timeout=30
+                socket_timeout=30,
+                max_connections=20
             )
+            self.client = redis.from_url(redis_url, **options)
             
             self.client.ping()
             self._connected = True
+            self._connection_args = (redis_url, options)
             logger.info("✅ Redis fallback connection successful")
             
         except Exception as e:
@@ -106,6 +112,25 @@ class RedisClient:
         except:
             return False
     
+    def close_pool(self):
+        """Disconnect every pooled connection; the next call reconnects"""
+        pool = getattr(self.client, "connection_pool", None)
+        if pool is not None:
+            pool.disconnect()
+        self._connected = False
+    
+    def get_async_client(self) -> Optional[redis.asyncio.Redis]:
+        """Shared redis.asyncio client for the server the sync client connected to.
+        
+        Returns None when there is no real connection (e.g. the mock client).
+        """
+        if not self._connected or self._connection_args is None:
+            return None
+        if self._async_client is None:
+            redis_url, options = self._connection_args
+            self._async_client = redis.asyncio.from_url(redis_url, **options)
+        return self._async_client
+    
     def _quick_connection_test(self) -> bool:
         """Quick Redis connection test with short timeout"""
         try:
@@ -235,6 +260,31 @@ class RedisClient:
             logger.error(f"Failed to get JSON: {e}")
             return None
     
+    def get_document_content(self, document_id: str) -> Optional[Dict]:
+        """Retrieve document content.
+        
+        Reads the hash at doc:content:{id}:meta (raw_text included) and falls
+        back to the legacy single JSON value at doc:content:{id}.
+        """
+        try:
+            if not self._connected:
+                self.connect()
+            if not self.client:
+                return None
+            
+            meta = self.client.hgetall(f"doc:content:{document_id}:meta")
+            if meta:
+                content = {
+                    (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+                    for k, v in meta.items()
+                }
+            else:
+                content = self.get_json(f"doc:content:{document_id}")
+            return content
+        except Exception as e:
+            logger.error(f"Failed to get document content: {e}")
+            return None
+    
     # Cache Operations
     def cache_search_result(self, query_hash: str, results: List[Dict], ttl: Optional[int] = None):
         """Cache search results"""
@@ -284,14 +334,13 @@ class RedisClient:
     # Utility methods
     def _serialize_vector(self, vector: List[float]) -> str:
         """Serialize vector for Redis storage"""
-        import struct
-        return struct.pack(f'{len(vector)}f', *vector).hex()
+        import numpy as np
+        return np.ascontiguousarray(vector, dtype=np.float32).tobytes().hex()
     
     def _deserialize_vector(self, vector_str: str) -> List[float]:
         """Deserialize vector from Redis"""
-        import struct
-        vector_bytes = bytes.fromhex(vector_str)
-        return list(struct.unpack(f'{len(vector_bytes)//4}f', vector_bytes))
+        import numpy as np
+        return np.frombuffer(bytes.fromhex(vector_str), dtype=np.float32).tolist()
     
     def _get_timestamp(self) -> str:
         """Get current timestamp"""
@@ -329,13 +378,23 @@ class MockRedisClient:
     def ping(self):
         return True
     
-    def set(self, key, value, ex=None):
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self._data:
+            return None
         self._data[key] = value
         return True
     
     def get(self, key):
         return self._data.get(key)
     
+    def mset(self, mapping):
+        self._data.update(mapping)
+        return True
+    
+    def mget(self, keys, *args):
+        keys = list(keys) if isinstance(keys, (list, tuple)) else [keys, *args]
+        return [self._data.get(key) for key in keys]
+    
     def hset(self, key, mapping=None, **kwargs):
         if key not in self._data:
             self._data[key] = {}
@@ -388,9 +447,54 @@ class MockRedisClient:
     def keys(self, pattern="*"):
         return list(self._data.keys())
     
+    def scan_iter(self, match=None, count=None, _type=None):
+        import fnmatch
+        keys = list(self._data.keys()) + list(self._sets.keys())
+        return iter(keys if match is None else fnmatch.filter(keys, match))
+    
+    def unlink(self, *keys):
+        return self.delete(*keys)
+    
     def time(self):
         import time
         return [int(time.time()), 0]
+    
+    def pipeline(self, transaction=True):
+        return MockPipeline(self)
+
+
+class MockPipeline:
+    """Mock pipeline that queues commands and runs them on execute()"""
+    
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+    
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+        
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+        return queue
+    
+    def execute(self, raise_on_error=True):
+        commands, self._commands = self._commands, []
+        results = []
+        for method, args, kwargs in commands:
+            try:
+                results.append(method(*args, **kwargs))
+            except Exception as e:
+                if raise_on_error:
+                    raise
+                results.append(e)
+        return results
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._commands = []
 
 
 class EnhancedMockRedisClient(MockRedisClient):
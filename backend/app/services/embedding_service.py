@@ -1,6 +1,6 @@
 import openai
 import numpy as np
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Union
 import logging
 import hashlib
 import json
@@ -13,6 +13,12 @@ try:
     SENTENCE_TRANSFORMERS_AVAILABLE = True
 except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
     
 from app.config import settings
 
@@ -105,20 +111,7 @@ class EmbeddingService:
                 return self.embedding_cache[cache_key]
             
             # Generate embedding based on method with proper availability checking
-            if method == "auto":
-                if self.openai_client:
-                    method = "openai"
-                    logger.debug("🤖 Auto-selected OpenAI embedding method")
-                elif self.local_model:
-                    method = "local"
-                    logger.debug("💻 Auto-selected local embedding method")
-                else:
-                    available_methods = []
-                    if self.openai_client:
-                        available_methods.append("openai")
-                    if self.local_model:
-                        available_methods.append("local")
-                    raise ValueError(f"No embedding methods available. OpenAI client: {self.openai_client is not None}, Local model: {self.local_model is not None}. Available: {available_methods}")
+            method = self._resolve_method(method)
             
             start_time = time.time()
             
@@ -153,35 +146,84 @@ class EmbeddingService:
             logger.error(f"Embedding generation failed: {e}")
             raise
     
+    def _resolve_method(self, method: str) -> str:
+        """Map "auto" to the preferred available provider; other methods pass through"""
+        if method != "auto":
+            return method
+        if self.openai_client:
+            logger.debug("🤖 Auto-selected OpenAI embedding method")
+            return "openai"
+        if self.local_model:
+            logger.debug("💻 Auto-selected local embedding method")
+            return "local"
+        raise ValueError(f"No embedding methods available. OpenAI client: {self.openai_client is not None}, Local model: {self.local_model is not None}")
+    
     async def generate_batch_embeddings(self, texts: List[str], method: str = "auto", batch_size: int = 10) -> List[Dict]:
-        """Generate embeddings for multiple texts efficiently"""
+        """Generate embeddings for multiple texts efficiently
+        
+        Results carry the same metadata as generate_embedding and share its
+        per-text cache, so only uncached texts reach the provider.
+        """
         try:
-            results = []
+            results: List[Optional[Dict]] = [None] * len(texts)
+            
+            # Cache keys use the method as requested, matching generate_embedding
+            pending = []
+            for index, text in enumerate(texts):
+                clean_text = self._prepare_text(text)
+                cache_key = self._get_cache_key(clean_text, method)
+                if cache_key in self.embedding_cache:
+                    results[index] = self.embedding_cache[cache_key]
+                else:
+                    pending.append((index, clean_text, cache_key))
+            
+            # Resolve "auto" up front so each batch goes out as one provider call
+            # rather than falling back to a request per text
+            method = self._resolve_method(method)
             
             # Process in batches to avoid rate limits
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                logger.info(f"Processing embedding batch {i//batch_size + 1}/{(len(texts)-1)//batch_size + 1}")
+            for i in range(0, len(pending), batch_size):
+                batch = pending[i:i + batch_size]
+                batch_texts = [clean_text for _, clean_text, _ in batch]
+                logger.info(f"Processing embedding batch {i//batch_size + 1}/{(len(pending)-1)//batch_size + 1}")
                 
                 # Generate embeddings for batch
                 if method == "openai" and self.openai_client:
-                    batch_results = await self._generate_openai_batch(batch)
+                    batch_method = "openai"
+                    start_time = time.time()
+                    batch_results = await self._generate_openai_batch(batch_texts)
                 elif method == "local" and self.local_model:
-                    batch_results = await self._generate_local_batch(batch)
+                    batch_method = "local"
+                    start_time = time.time()
+                    batch_results = await self._generate_local_batch(batch_texts)
                 else:
-                    # Fallback to individual generation
+                    # Fallback to individual generation (adds metadata and caches itself)
+                    batch_method = None
                     batch_results = []
-                    for text in batch:
+                    for text in batch_texts:
                         result = await self.generate_embedding(text, method)
                         batch_results.append(result)
                 
-                results.extend(batch_results)
+                if batch_method:
+                    # Batch time is shared evenly across the texts in the call
+                    generation_time = (time.time() - start_time) / len(batch)
+                    for (_, clean_text, cache_key), result in zip(batch, batch_results):
+                        result.update({
+                            "method": batch_method,
+                            "generation_time": generation_time,
+                            "text_length": len(clean_text),
+                            "cache_key": cache_key
+                        })
+                        self.embedding_cache[cache_key] = result
+                
+                for (index, _, _), result in zip(batch, batch_results):
+                    results[index] = result
                 
                 # Small delay to respect rate limits
                 if method == "openai":
                     await asyncio.sleep(0.1)
             
-            logger.info(f"Generated {len(results)} embeddings in batches")
+            logger.info(f"Generated {len(pending)} embeddings in batches ({len(texts) - len(pending)} cached)")
             return results
             
         except Exception as e:
@@ -302,11 +344,22 @@ class EmbeddingService:
         content = f"{method}:{text}"
         return hashlib.md5(content.encode()).hexdigest()
     
-    def calculate_similarity(self, vector1: List[float], vector2: List[float]) -> float:
-        """Calculate cosine similarity between vectors"""
+    def calculate_similarity(self, vector1: List[float], vector2: Union[List[float], np.ndarray]) -> Union[float, np.ndarray]:
+        """Calculate cosine similarity between vectors
+        
+        vector2 may also be a (B, D) matrix of candidates, in which case a (B,)
+        array of similarities comes back from a single matrix-vector product.
+        """
         try:
-            v1 = np.array(vector1)
-            v2 = np.array(vector2)
+            v1 = np.asarray(vector1, dtype=np.float32)
+            v2 = np.asarray(vector2, dtype=np.float32)
+            
+            if v2.ndim == 2:
+                return self._batch_similarity(v1, v2)
+            
+            # SIMD kernel computing dot product and both norms in one pass; returns cosine distance
+            if SIMSIMD_AVAILABLE:
+                return 1.0 - float(simsimd.cosine(v1, v2))
             
             # Cosine similarity
             dot_product = np.dot(v1, v2)
@@ -320,8 +373,23 @@ class EmbeddingService:
             
         except Exception as e:
             logger.error(f"Similarity calculation failed: {e}")
+            # Callers of the matrix form index into the result
+            if isinstance(vector2, np.ndarray) and vector2.ndim == 2:
+                return np.zeros(len(vector2), dtype=np.float32)
             return 0.0
     
+    @staticmethod
+    def _batch_similarity(query: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """Cosine similarity of query against every row of candidates; zero vectors score 0.0"""
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            return np.zeros(len(candidates), dtype=np.float32)
+        
+        row_norms = np.linalg.norm(candidates, axis=1)
+        row_norms[row_norms == 0] = np.inf
+        
+        return (candidates @ query) / (row_norms * query_norm)
+    
     def get_embedding_stats(self) -> Dict:
         """Get embedding service statistics"""
         # Determine default method based on availability
@@ -336,7 +404,8 @@ class EmbeddingService:
             "cache_size": len(self.embedding_cache),
             "openai_available": self.openai_client is not None,
             "local_model_available": self.local_model is not None,
-            "default_method": default_method
+            "default_method": default_method,
+            "similarity_backend": "simsimd" if SIMSIMD_AVAILABLE else "numpy"
         }
     
     def clear_cache(self):
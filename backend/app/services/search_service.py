@@ -15,8 +15,8 @@ logger = logging.getLogger(__name__)
 class SearchService:
     """Service for performing semantic search on documents"""
     
-    def __init__(self):
-        self.embedding_service = EmbeddingService()
+    def __init__(self, embedding_service: Optional[EmbeddingService] = None):
+        self.embedding_service = embedding_service or EmbeddingService()
     
     async def search_similar_documents(
         self,
@@ -36,46 +36,63 @@ class SearchService:
                 logger.info("No document chunks found for search")
                 return []
             
-            similar_chunks = []
+            query_vector = np.asarray(query_embedding, dtype=np.float32)
             
+            candidates = []
             for chunk_key in chunk_keys:
                 try:
                     chunk_data = redis_client.get_json(chunk_key)
                     if not chunk_data or 'embedding' not in chunk_data:
                         continue
                     
-                    # Calculate similarity
-                    similarity = self.embedding_service.calculate_similarity(
-                        query_embedding, 
-                        chunk_data['embedding']
-                    )
+                    if len(chunk_data['embedding']) != len(query_vector):
+                        logger.warning(f"Skipping chunk {chunk_key}: embedding dimension mismatch")
+                        continue
+                    
+                    candidates.append((chunk_key, chunk_data))
+                    
+                except Exception as e:
+                    logger.warning(f"Error processing chunk {chunk_key}: {e}")
+                    continue
+            
+            if not candidates:
+                return []
+            
+            # Score every candidate in one matrix-vector product instead of a call per chunk
+            candidate_matrix = np.asarray([chunk_data['embedding'] for _, chunk_data in candidates], dtype=np.float32)
+            scores = self.embedding_service.calculate_similarity(query_vector, candidate_matrix)
+            
+            similar_chunks = []
+            
+            for index in np.flatnonzero(scores >= threshold):
+                chunk_key, chunk_data = candidates[index]
+                similarity = float(scores[index])
+                try:
+                    # Get document metadata
+                    doc_id = chunk_data.get('document_id')
+                    metadata = None
+                    if doc_id:
+                        metadata_raw = redis_client.get_json(f"doc:meta:{doc_id}")
+                        if metadata_raw:
+                            metadata = DocumentMetadata(**metadata_raw)
+                    
+                    # Apply filters if provided
+                    if filters and not self._apply_filters(metadata, filters):
+                        continue
+                    
+                    similar_chunks.append({
+                        "document_id": doc_id,
+                        "filename": metadata.filename if metadata else "unknown",
+                        "similarity_score": similarity,
+                        "matched_chunk": chunk_data.get('text', ''),
+                        "chunk_index": chunk_data.get('chunk_index', 0),
+                        "metadata": metadata,
+                        "highlight": self._generate_highlight(
+                            chunk_data.get('text', ''), 
+                            similarity
+                        )
+                    })
                     
-                    if similarity >= threshold:
-                        # Get document metadata
-                        doc_id = chunk_data.get('document_id')
-                        metadata = None
-                        if doc_id:
-                            metadata_raw = redis_client.get_json(f"doc:meta:{doc_id}")
-                            if metadata_raw:
-                                metadata = DocumentMetadata(**metadata_raw)
-                        
-                        # Apply filters if provided
-                        if filters and not self._apply_filters(metadata, filters):
-                            continue
-                        
-                        similar_chunks.append({
-                            "document_id": doc_id,
-                            "filename": metadata.filename if metadata else "unknown",
-                            "similarity_score": similarity,
-                            "matched_chunk": chunk_data.get('text', ''),
-                            "chunk_index": chunk_data.get('chunk_index', 0),
-                            "metadata": metadata,
-                            "highlight": self._generate_highlight(
-                                chunk_data.get('text', ''), 
-                                similarity
-                            )
-                        })
-                        
                 except Exception as e:
                     logger.warning(f"Error processing chunk {chunk_key}: {e}")
                     continue
@@ -208,7 +225,7 @@ class SearchService:
         """
         try:
             # Get document content
-            content_data = redis_client.get_json(f"doc:content:{document_id}")
+            content_data = redis_client.get_document_content(document_id)
             if not content_data:
                 logger.error(f"No content found for document {document_id}")
                 return False
@@ -282,9 +299,17 @@ class SearchService:
             content_keys = redis_client.client.keys("doc:content:*")
             matching_docs = []
             
-            for content_key in content_keys:
+            # doc:content:{id} (legacy JSON) and doc:content:{id}:meta both name one document.
+            # The mock client ignores the pattern, so anything else is skipped here
+            content_ids = set()
+            for key in content_keys:
+                parts = (key.decode() if isinstance(key, bytes) else key).split(":")
+                if parts[:2] == ["doc", "content"] and (len(parts) == 3 or parts[3:] == ["meta"]):
+                    content_ids.add(parts[2])
+            
+            for content_id in content_ids:
                 try:
-                    content_data = redis_client.get_json(content_key)
+                    content_data = redis_client.get_document_content(content_id)
                     if not content_data or 'raw_text' not in content_data:
                         continue
                     
@@ -313,7 +338,7 @@ class SearchService:
                         })
                         
                 except Exception as e:
-                    logger.warning(f"Error processing content key {content_key}: {e}")
+                    logger.warning(f"Error processing content {content_id}: {e}")
                     continue
             
             # Sort by relevance and limit
@@ -19,6 +19,10 @@ class TextChunker:
     
     async def chunk_text(self, text: str, doc_id: str, metadata: Dict) -> List[Dict]:
         """Chunk text intelligently based on content structure"""
+        return self.chunk_text_sync(text, doc_id, metadata)
+    
+    def chunk_text_sync(self, text: str, doc_id: str, metadata: Dict) -> List[Dict]:
+        """Synchronous core of chunk_text, for running in a worker thread or process"""
         try:
             if not text or not text.strip():
                 return []
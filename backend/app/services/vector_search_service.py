@@ -13,6 +13,10 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Stored vectors are little-endian float32. Legacy vectors were written with a
+# native-endian struct.pack, which is the same bytes on little-endian hosts.
+VECTOR_DTYPE = np.dtype('<f4')
+
 class VectorSearchService:
     """Redis Vector Sets-based semantic search"""
     
@@ -467,35 +471,26 @@ class VectorSearchService:
     def _serialize_vector(self, vector: List[float]) -> bytes:
         """Serialize vector for Redis storage (per Python redis-py docs)"""
         import numpy as np
-        # Ensure vector is exactly the right format for Redis Stack
-        vector_array = np.array(vector, dtype=np.float32)
+        # Little-endian float32 in one contiguous buffer (Redis Stack default)
+        vector_array = np.ascontiguousarray(vector, dtype=VECTOR_DTYPE)
         
         # Validate dimensions
         if len(vector_array) != settings.embedding_dimensions:
             raise ValueError(f"Vector dimension mismatch: got {len(vector_array)}, expected {settings.embedding_dimensions}")
         
-        # Convert to bytes in little-endian format (Redis Stack default)
-        vector_bytes = vector_array.astype('<f4').tobytes()
+        vector_bytes = vector_array.tobytes()
         
         logger.info(f"Serialized vector: {len(vector)} floats -> {len(vector_bytes)} bytes")
         return vector_bytes
     
-    def _deserialize_vector(self, vector_bytes: bytes) -> List[float]:
-        """Deserialize vector from Redis (backward compatible)"""
-        import numpy as np
-        import struct
+    def _deserialize_vector(self, vector_bytes: bytes) -> np.ndarray:
+        """Deserialize vector from Redis (backward compatible)
         
-        try:
-            # Try new numpy format first
-            return np.frombuffer(vector_bytes, dtype=np.float32).tolist()
-        except Exception:
-            try:
-                # Fallback to old struct format for backward compatibility
-                num_floats = len(vector_bytes) // 4
-                return list(struct.unpack(f'{num_floats}f', vector_bytes))
-            except Exception as e:
-                logger.error(f"Failed to deserialize vector: {e}")
-                raise
+        Returns a read-only float32 view of the bytes; similarity code takes it
+        as-is, so no per-element Python floats are created. Legacy struct.pack
+        vectors share the layout, so one reader covers both.
+        """
+        return np.frombuffer(vector_bytes, dtype=VECTOR_DTYPE)
     
     async def debug_vector_storage(self):
         """Debug method to check what's actually in Redis"""
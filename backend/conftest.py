@@ -0,0 +1,15 @@
+"""
+Shared pytest configuration for the DocuMind backend
+"""
+import os
+
+# Run the app in degraded mode (mock Redis) unless the caller says otherwise
+os.environ.setdefault("PORT", "8080")
+os.environ.setdefault("REDIS_REQUIRED", "false")
+os.environ.setdefault("ENVIRONMENT", "test")
+
+# Standalone debug scripts that execute at import time; run them directly instead
+collect_ignore = [
+    "test_redis.py",
+    "test_functionality.py",
+]
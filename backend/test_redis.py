@@ -3,43 +3,40 @@
 Simple Redis connection test script
 """
 import sys
-import os
 
-# Add the app directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+from tests._shared import get_redis, redis_healthy
 
-from app.database.redis_client import redis_client
+redis_client = get_redis()
 
-def test_redis_connection():
+def test_redis_connection(verbose=False):
     """Test Redis connection and basic operations"""
     print("🔍 Testing Redis connection...")
     
     try:
         # Test basic connection
-        health = redis_client.health_check()
+        health = redis_healthy()
         print(f"✅ Redis health check: {'PASSED' if health else 'FAILED'}")
         
         if health:
             # Test basic operations
             print("\n📊 Testing basic Redis operations...")
             
-            # Set a test key
-            redis_client.client.set("test:connection", "success", ex=60)
-            print("✅ SET operation: PASSED")
-            
-            # Get the test key
-            value = redis_client.client.get("test:connection")
+            # SET, GET and DELETE share a single round-trip
+            pipe = redis_client.client.pipeline(transaction=False)
+            pipe.set("test:connection", "success", ex=60)
+            pipe.get("test:connection")
+            pipe.delete("test:connection")
+            set_result, value, deleted = pipe.execute()
+            print(f"✅ SET operation: {'PASSED' if set_result else 'FAILED'}")
             print(f"✅ GET operation: PASSED (value: {value})")
             
             # Test stats
             stats = redis_client.get_stats()
-            print(f"\n📈 Redis Stats:")
-            for key, value in stats.items():
-                print(f"  {key}: {value}")
+            if verbose:
+                print(f"\n📈 Redis Stats:")
+                print("\n".join(f"  {key}: {value}" for key, value in stats.items()))
             
-            # Clean up
-            redis_client.client.delete("test:connection")
-            print("\n🧹 Cleanup: PASSED")
+            print(f"\n🧹 Cleanup: {'PASSED' if deleted else 'FAILED'}")
             
             print("\n🎉 All Redis tests PASSED! Your Redis Cloud connection is working perfectly.")
             return True
@@ -49,5 +46,11 @@ def test_redis_connection():
         return False
 
 if __name__ == "__main__":
-    success = test_redis_connection()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Redis connection test")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print Redis stats")
+    args = parser.parse_args()
+    
+    success = test_redis_connection(verbose=args.verbose)
     sys.exit(0 if success else 1)
@@ -0,0 +1,27 @@
+"""
+Helpers shared by the backend test scripts
+"""
+import atexit
+import functools
+import time
+
+# Seconds a health check result is reused for
+HEALTH_CHECK_TTL = 5
+
+
+@functools.cache
+def get_redis():
+    """Return the global Redis client, imported once per process"""
+    from app.database.redis_client import redis_client
+    atexit.register(redis_client.close_pool)
+    return redis_client
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_health(bucket):
+    return get_redis().health_check()
+
+
+def redis_healthy():
+    """Redis health check, cached for HEALTH_CHECK_TTL seconds"""
+    return _cached_health(int(time.monotonic() // HEALTH_CHECK_TTL))
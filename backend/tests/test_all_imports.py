@@ -0,0 +1,17 @@
+"""
+Import checks for the backend's module-level singletons
+"""
+import importlib
+
+import pytest
+
+
+@pytest.mark.parametrize("modname,attr", [
+    ("app.main", "app"),
+    ("app.services.document_processor", "document_processor"),
+    ("app.services.vector_search_service", "vector_search_service"),
+    ("app.database.redis_client", "redis_client"),
+])
+def test_importable(modname, attr):
+    module = importlib.import_module(modname)
+    assert hasattr(module, attr)
@@ -0,0 +1,204 @@
+"""
+Smoke tests for the DocuMind backend
+
+Covers what the standalone Redis, uvicorn and UTF-8 debug scripts check, in a
+single module so the FastAPI/NumPy import graph is only paid once per run.
+"""
+import functools
+import os
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from tests._shared import get_redis, redis_healthy
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@functools.lru_cache(maxsize=1)
+def _load():
+    """Import the app and its service singletons once per session"""
+    from app.main import app
+    from app.services.document_processor import document_processor
+    from app.services.vector_search_service import vector_search_service
+    return SimpleNamespace(
+        app=app,
+        redis_client=get_redis(),
+        document_processor=document_processor,
+        vector_search_service=vector_search_service,
+    )
+
+
+@pytest.fixture(scope="session")
+def fastapi_app():
+    """The FastAPI application, imported once per session"""
+    yield _load().app
+
+
+@pytest.fixture(scope="session")
+def redis():
+    """The global Redis client, imported once per session"""
+    yield _load().redis_client
+
+
+@pytest.fixture(scope="session")
+def vector_service():
+    """A VectorSearchService instance shared by every test"""
+    from app.services.vector_search_service import VectorSearchService
+    yield VectorSearchService()
+
+
+def test_app_creation(fastapi_app):
+    """FastAPI app is built with its core routes registered"""
+    routes = {route.path for route in fastapi_app.routes}
+    assert "/health" in routes
+    assert "/api/stats" in routes
+
+
+def test_redis_connection(redis):
+    """Redis (or the degraded-mode mock) answers basic commands"""
+    assert redis_healthy()
+
+    pipe = redis.client.pipeline(transaction=False)
+    pipe.set("test:connection", "success", ex=60)
+    pipe.get("test:connection")
+    pipe.delete("test:connection")
+    set_result, value, deleted = pipe.execute()
+    assert set_result
+    assert value == "success"
+    assert deleted == 1
+
+    stats = redis.get_stats()
+    assert "total_keys" in stats
+
+
+def test_utf8_decode(vector_service):
+    """Vector bytes round-trip without being treated as UTF-8 text"""
+    from app.config import settings
+
+    test_vector = np.linspace(-1.0, 1.0, settings.embedding_dimensions, dtype=np.float32)
+
+    # struct.pack (old format) and numpy.tobytes (new format) are byte-identical
+    old_bytes = struct.pack(f'{len(test_vector)}f', *test_vector.tolist())
+    new_bytes = test_vector.tobytes()
+    assert old_bytes == new_bytes
+
+    # Stored vectors are explicitly little-endian float32, whatever the host order
+    from app.services.vector_search_service import VECTOR_DTYPE
+    assert np.array([0.1, 0.2, 0.3], dtype=VECTOR_DTYPE).tobytes() == struct.pack('<3f', 0.1, 0.2, 0.3)
+
+    # A leading 0x9c byte is invalid UTF-8 but a perfectly valid float32 buffer
+    problematic_bytes = bytes([0x9c, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04])
+    assert len(np.frombuffer(problematic_bytes, dtype=np.float32)) == 2
+
+    serialized = vector_service._serialize_vector(test_vector.tolist())
+    assert isinstance(serialized, bytes)
+    deserialized = vector_service._deserialize_vector(serialized)
+    assert np.allclose(deserialized, test_vector)
+
+
+class _FakeLocalModel:
+    """Stands in for SentenceTransformer: deterministic unit vectors, no download"""
+
+    def __init__(self, dimensions):
+        self.dimensions = dimensions
+
+    def encode(self, texts, normalize_embeddings=True, batch_size=32):
+        rng = np.random.default_rng(len(texts))
+        vectors = rng.standard_normal((len(texts), self.dimensions)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_document_vectors_auto_method(redis, vector_service, monkeypatch):
+    """Chunks embedded through the default "auto" batch path are stored as vectors"""
+    import asyncio
+    import uuid
+    from app.config import settings
+    from app.services.embedding_service import embedding_service
+
+    monkeypatch.setattr(embedding_service, "openai_client", None)
+    monkeypatch.setattr(embedding_service, "local_model", _FakeLocalModel(settings.embedding_dimensions))
+    monkeypatch.setattr(embedding_service, "embedding_cache", {})
+
+    doc_id = f"test-{uuid.uuid4()}"
+    chunks = [
+        {"chunk_id": f"{doc_id}:{i}", "text": f"Test chunk {i} about vectors", "word_count": 5, "chunk_index": i}
+        for i in range(3)
+    ]
+
+    try:
+        vectors_added = asyncio.run(vector_service.add_document_vectors(doc_id, chunks))
+        assert vectors_added == len(chunks)
+
+        stored = redis.client.hgetall(f"vector:{chunks[0]['chunk_id']}")
+        assert stored["embedding_method"] == "local"
+        assert stored["doc_id"] == doc_id
+    finally:
+        redis.client.delete(*(f"vector:{chunk['chunk_id']}" for chunk in chunks))
+
+
+def test_app_lifespan(fastapi_app):
+    """App starts up, serves /health and shuts down in-process"""
+    from fastapi.testclient import TestClient
+
+    with TestClient(fastapi_app) as client:
+        response = client.get("/health")
+    assert response.status_code == 200
+
+
+def _free_port(host):
+    """An ephemeral port the OS reports as free right now"""
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_health(process, url, timeout):
+    """Poll url until it answers; gives up early if the process exits"""
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return httpx.get(url, timeout=1)
+        except httpx.TransportError:
+            pass
+        if process.poll() is not None:
+            return None
+        time.sleep(0.02)
+    return None
+
+
+def test_uvicorn_spawn():
+    """Uvicorn can serve the app from a real TCP port"""
+    host = "127.0.0.1"
+    port = _free_port(host)
+
+    # Log to a file rather than a pipe: nothing has to drain it while we wait
+    with tempfile.TemporaryFile() as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app",
+             "--host", host, "--port", str(port), "--log-level", "info"],
+            cwd=BACKEND_DIR,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+        try:
+            response = _wait_for_health(process, f"http://{host}:{port}/health", timeout=10)
+        finally:
+            process.terminate()
+            process.wait(timeout=5)
+
+        log.seek(0)
+        output = log.read().decode(errors="replace")
+
+    assert response is not None, f"Uvicorn did not serve /health within 10 seconds:\n{output}"
+    assert response.status_code == 200
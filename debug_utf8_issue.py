@@ -2,43 +2,74 @@
 """
 Focused debug script to understand the UTF-8 decode issue
 """
-import sys
-import os
-import numpy as np
-import struct
+from functools import lru_cache
 
-# Add backend to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+TEST_VECTOR = (0.1, 0.2, 0.3, -0.4, 0.5)
 
-def analyze_utf8_decode_error():
+# Byte/hex dumps are only printed with -v
+VERBOSE = False
+
+def vprint(*args, **kwargs):
+    """Print only in verbose mode"""
+    if VERBOSE:
+        print(*args, **kwargs)
+
+@lru_cache(maxsize=1)
+def _service():
+    """Shared VectorSearchService instance, built on first use"""
+    from app.services.vector_search_service import VectorSearchService
+    return VectorSearchService()
+
+@lru_cache(maxsize=None)
+def _pack_old(vector: tuple) -> bytes:
+    """Serialize a vector with struct.pack (OLD format)"""
+    import struct
+    return struct.pack(f'{len(vector)}f', *vector)
+
+@lru_cache(maxsize=None)
+def _pack_new(vector: tuple) -> bytes:
+    """Serialize a vector with numpy.tobytes (NEW format)"""
+    import numpy as np
+    return np.ascontiguousarray(vector, dtype=np.float32).tobytes()
+
+def _contains_byte(buf: bytes, value: int) -> bool:
+    """Check whether a byte value occurs anywhere in buf"""
+    import numpy as np
+    return bool((np.frombuffer(buf, dtype=np.uint8) == value).any())
+
+def analyze_utf8_decode_error(compare: bool = False):
     """Analyze the specific UTF-8 decode error we're seeing"""
+    import numpy as np
+    
     print("🔍 Analyzing UTF-8 Decode Error")
     print("=" * 40)
     
     # Create test vector
-    test_vector = [0.1, 0.2, 0.3, -0.4, 0.5]
-    print(f"Test vector: {test_vector}")
+    test_vector = list(TEST_VECTOR)
+    vprint(f"Test vector: {test_vector}")
     
-    # Method 1: struct.pack (OLD format)
-    old_bytes = struct.pack(f'{len(test_vector)}f', *test_vector)
-    print(f"\nOLD format (struct.pack):")
-    print(f"  Bytes length: {len(old_bytes)}")
-    print(f"  First 10 bytes: {old_bytes[:10]}")
-    print(f"  Hex representation: {old_bytes.hex()}")
-    print(f"  Byte at position 0: 0x{old_bytes[0]:02x} (decimal: {old_bytes[0]})")
-    
-    # Method 2: numpy.tobytes (NEW format)  
-    new_bytes = np.array(test_vector, dtype=np.float32).tobytes()
+    # numpy.tobytes (canonical format)
+    new_bytes = _pack_new(TEST_VECTOR)
     print(f"\nNEW format (numpy.tobytes):")
-    print(f"  Bytes length: {len(new_bytes)}")
-    print(f"  First 10 bytes: {new_bytes[:10]}")
-    print(f"  Hex representation: {new_bytes.hex()}")
-    print(f"  Byte at position 0: 0x{new_bytes[0]:02x} (decimal: {new_bytes[0]})")
+    vprint(f"  Bytes length: {len(new_bytes)}")
+    vprint(f"  First 10 bytes: {new_bytes[:10]}")
+    vprint(f"  Hex representation: {new_bytes.hex()}")
+    vprint(f"  Byte at position 0: 0x{new_bytes[0]:02x} (decimal: {new_bytes[0]})")
     
-    # Check if 0x9c appears in either format
     print(f"\nLooking for problematic byte 0x9c (decimal 156):")
-    print(f"  In OLD format: {'YES' if 0x9c in old_bytes else 'NO'}")
-    print(f"  In NEW format: {'YES' if 0x9c in new_bytes else 'NO'}")
+    print(f"  In NEW format: {'YES' if _contains_byte(new_bytes, 0x9c) else 'NO'}")
+    
+    if not compare:
+        return
+    
+    # struct.pack (OLD format), only needed to validate cross-compatibility
+    old_bytes = _pack_old(TEST_VECTOR)
+    print(f"\nOLD format (struct.pack):")
+    vprint(f"  Bytes length: {len(old_bytes)}")
+    vprint(f"  First 10 bytes: {old_bytes[:10]}")
+    vprint(f"  Hex representation: {old_bytes.hex()}")
+    vprint(f"  Byte at position 0: 0x{old_bytes[0]:02x} (decimal: {old_bytes[0]})")
+    print(f"  Contains 0x9c: {'YES' if _contains_byte(old_bytes, 0x9c) else 'NO'}")
     
     # Test cross-compatibility
     print(f"\n🔄 Cross-Compatibility Test:")
@@ -46,29 +77,26 @@ def analyze_utf8_decode_error():
     # Try numpy.frombuffer on old bytes
     print("  numpy.frombuffer on OLD bytes:")
     try:
-        result = np.frombuffer(old_bytes, dtype=np.float32).tolist()
+        result = np.frombuffer(old_bytes, dtype=np.float32)
         print(f"    ✅ Success: {result}")
     except Exception as e:
         print(f"    ❌ Error: {e}")
     
-    # Try struct.unpack on new bytes
-    print("  struct.unpack on NEW bytes:")
-    try:
-        num_floats = len(new_bytes) // 4
-        result = list(struct.unpack(f'{num_floats}f', new_bytes))
-        print(f"    ✅ Success: {result}")
-    except Exception as e:
-        print(f"    ❌ Error: {e}")
+    # The production reader has no struct fallback; it relies on the bytes being identical
+    print(f"  OLD and NEW bytes identical: {'YES' if old_bytes == new_bytes else 'NO'}")
 
 def test_specific_error_byte():
     """Test with the specific byte that's causing the error"""
+    import numpy as np
+    import struct
+    
     print(f"\n🚨 Testing Specific Error Byte (0x9c)")
     print("=" * 40)
     
     # Create a byte sequence that starts with 0x9c
     problematic_bytes = bytes([0x9c, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04])
-    print(f"Problematic bytes: {problematic_bytes}")
-    print(f"Hex: {problematic_bytes.hex()}")
+    vprint(f"Problematic bytes: {problematic_bytes}")
+    vprint(f"Hex: {problematic_bytes.hex()}")
     
     # Try to decode with numpy
     print("Trying numpy.frombuffer:")
@@ -93,20 +121,18 @@ def simulate_redis_vector_search_error():
     print("=" * 40)
     
     try:
-        from app.services.vector_search_service import VectorSearchService
-        
-        # Create service instance
-        service = VectorSearchService()
+        # Reuse the shared service instance
+        service = _service()
         
         # Test serialization methods
-        test_vector = [0.1, 0.2, 0.3, -0.4, 0.5]
+        test_vector = list(TEST_VECTOR)
         
         print("Testing current serialization method:")
         try:
             serialized = service._serialize_vector(test_vector)
             print(f"  ✅ Serialization success: {len(serialized)} bytes")
-            print(f"  First 10 bytes: {serialized[:10]}")
-            print(f"  Hex: {serialized.hex()}")
+            vprint(f"  First 10 bytes: {serialized[:10]}")
+            vprint(f"  Hex: {serialized.hex()}")
             
             # Test deserialization
             deserialized = service._deserialize_vector(serialized)
@@ -119,10 +145,20 @@ def simulate_redis_vector_search_error():
         print(f"❌ Failed to import VectorSearchService: {e}")
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Debug vector bytes vs UTF-8 decoding")
+    parser.add_argument("--compare", action="store_true",
+                        help="also compare against the legacy struct.pack format")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="print byte and hex dumps")
+    args = parser.parse_args()
+    VERBOSE = args.verbose
+    
     print("🚀 UTF-8 Decode Error Debug Script")
     print("=" * 50)
     
-    analyze_utf8_decode_error()
+    analyze_utf8_decode_error(compare=args.compare)
     test_specific_error_byte()
     simulate_redis_vector_search_error()
     
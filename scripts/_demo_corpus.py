@@ -0,0 +1,173 @@
+"""
+Sample document corpus shared by the DocuMind demo loaders
+"""
+import re
+
+# Counts whitespace-separated words like str.split() without building the list
+_WORD_RE = re.compile(r'\S+')
+
+# Sample document contents
+SAMPLE_DOCS = [
+    {
+        "filename": "machine_learning_intro.txt",
+        "content": """Machine Learning Introduction
+
+Machine learning is a subset of artificial intelligence (AI) that provides systems the ability to automatically learn and improve from experience without being explicitly programmed. Machine learning focuses on the development of computer programs that can access data and use it to learn for themselves.
+
+The process of learning begins with observations or data, such as examples, direct experience, or instruction, in order to look for patterns in data and make better decisions in the future based on the examples that we provide. The primary aim is to allow the computers to learn automatically without human intervention or assistance and adjust actions accordingly.
+
+Types of Machine Learning:
+1. Supervised Learning - Uses labeled training data
+2. Unsupervised Learning - Finds patterns in unlabeled data  
+3. Reinforcement Learning - Learns through interaction with environment
+
+Applications include image recognition, natural language processing, recommendation systems, and autonomous vehicles.""",
+        "file_type": "txt"
+    },
+    {
+        "filename": "python_programming_guide.txt", 
+        "content": """Python Programming Guide
+
+Python is a high-level, interpreted programming language with dynamic semantics. Its high-level built-in data structures, combined with dynamic typing and dynamic binding, make it very attractive for Rapid Application Development, as well as for use as a scripting or glue language to connect existing components together.
+
+Key Features:
+- Easy to learn and use
+- Interpreted language
+- Object-oriented programming support
+- Extensive standard library
+- Cross-platform compatibility
+
+Popular Python Libraries:
+- NumPy: Numerical computing
+- Pandas: Data manipulation and analysis
+- Matplotlib: Data visualization
+- Scikit-learn: Machine learning
+- Django/Flask: Web development
+- TensorFlow/PyTorch: Deep learning
+
+Python is widely used in web development, data science, artificial intelligence, automation, and scientific computing.""",
+        "file_type": "txt"
+    },
+    {
+        "filename": "database_design_principles.txt",
+        "content": """Database Design Principles
+
+Database design is the process of producing a detailed data model of a database. This data model contains all the needed logical and physical design choices and physical storage parameters needed to generate a design in a data definition language.
+
+Key Principles:
+
+1. Normalization
+   - Eliminate redundant data
+   - Ensure data dependencies make sense
+   - Reduce storage space and improve data integrity
+
+2. Entity-Relationship Modeling
+   - Identify entities (tables)
+   - Define relationships between entities
+   - Establish primary and foreign keys
+
+3. Indexing Strategy
+   - Create indexes on frequently queried columns
+   - Balance query performance with storage overhead
+   - Consider composite indexes for multi-column queries
+
+4. Data Types and Constraints
+   - Choose appropriate data types
+   - Implement referential integrity
+   - Use check constraints for data validation
+
+5. Performance Considerations
+   - Denormalization when appropriate
+   - Partitioning for large datasets
+   - Query optimization techniques
+
+Modern databases support ACID properties (Atomicity, Consistency, Isolation, Durability) to ensure reliable transaction processing.""",
+        "file_type": "txt"
+    },
+    {
+        "filename": "artificial_intelligence_overview.txt",
+        "content": """Artificial Intelligence Overview
+
+Artificial Intelligence (AI) refers to the simulation of human intelligence in machines that are programmed to think and learn like humans. The term may also be applied to any machine that exhibits traits associated with a human mind such as learning and problem-solving.
+
+AI Categories:
+
+1. Narrow AI (Weak AI)
+   - Designed for specific tasks
+   - Current state of most AI systems
+   - Examples: voice assistants, recommendation systems
+
+2. General AI (Strong AI)
+   - Human-level intelligence across all domains
+   - Theoretical concept, not yet achieved
+   - Would match human cognitive abilities
+
+3. Superintelligence
+   - Surpasses human intelligence
+   - Hypothetical future development
+   - Subject of ongoing research and debate
+
+AI Techniques:
+- Machine Learning
+- Deep Learning
+- Natural Language Processing
+- Computer Vision
+- Robotics
+- Expert Systems
+
+Applications span healthcare, finance, transportation, entertainment, and many other industries. AI continues to evolve rapidly with advances in computing power and algorithmic improvements.""",
+        "file_type": "txt"
+    },
+    {
+        "filename": "data_science_methodology.txt",
+        "content": """Data Science Methodology
+
+Data science is an interdisciplinary field that uses scientific methods, processes, algorithms, and systems to extract knowledge and insights from structured and unstructured data.
+
+The Data Science Process:
+
+1. Problem Definition
+   - Understand business objectives
+   - Define success metrics
+   - Identify data requirements
+
+2. Data Collection
+   - Gather relevant datasets
+   - Ensure data quality and completeness
+   - Consider data privacy and ethics
+
+3. Data Exploration and Cleaning
+   - Exploratory data analysis (EDA)
+   - Handle missing values
+   - Remove outliers and inconsistencies
+
+4. Feature Engineering
+   - Select relevant features
+   - Create new features from existing data
+   - Transform variables as needed
+
+5. Model Development
+   - Choose appropriate algorithms
+   - Train and validate models
+   - Tune hyperparameters
+
+6. Model Evaluation
+   - Assess model performance
+   - Cross-validation techniques
+   - Compare different approaches
+
+7. Deployment and Monitoring
+   - Implement models in production
+   - Monitor performance over time
+   - Update models as needed
+
+Tools commonly used include Python, R, SQL, Jupyter notebooks, and various machine learning libraries.""",
+        "file_type": "txt"
+    }
+]
+
+# The corpus is constant: measure each document once at import time
+for _doc in SAMPLE_DOCS:
+    _doc["_bytes"] = _doc["content"].encode('utf-8')
+    _doc["_size"] = len(_doc["_bytes"])
+    _doc["_words"] = sum(1 for _ in _WORD_RE.finditer(_doc["content"]))
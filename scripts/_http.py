@@ -0,0 +1,32 @@
+"""
+Shared HTTP client for the DocuMind API test scripts
+"""
+import functools
+
+import httpx
+
+# HTTP/2 needs the h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+try:
+    import h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+@functools.lru_cache(maxsize=1)
+def get_client() -> httpx.AsyncClient:
+    """The process-wide AsyncClient, so scripts run back-to-back share one connection pool.
+
+    Building the client is synchronous, so this is a plain function; the cache
+    hands every caller the same instance until close_client() is awaited.
+    """
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=128, max_keepalive_connections=64, keepalive_expiry=60),
+        timeout=30.0
+    )
+
+async def close_client():
+    """Close the shared client, if one was created, and forget it"""
+    if get_client.cache_info().currsize:
+        await get_client().aclose()
+        get_client.cache_clear()
@@ -39,9 +39,13 @@ def initialize_counters() -> bool:
             "stats:cache_hits"
         ]
         
+        # SET NX per counter, all in one round-trip
+        pipe = redis_client.client.pipeline(transaction=False)
         for counter in counters:
-            if not redis_client.client.exists(counter):
-                redis_client.client.set(counter, 0)
+            pipe.set(counter, 0, nx=True)
+        
+        for counter, created in zip(counters, pipe.execute()):
+            if created:
                 logger.info(f"Initialized counter: {counter}")
         
         logger.info("✅ Analytics counters initialized")
@@ -1,12 +1,16 @@
-import requests
+import asyncio
+import httpx
 import json
 import time
 from pathlib import Path
 
+from _http import get_client, close_client
+
 API_BASE = "http://localhost:8000"
 
-def test_document_upload():
+async def test_document_upload():
     """Test document upload and processing"""
+    client = get_client()
     print("🧪 Testing Document Processing Pipeline")
     print("=" * 50)
     
@@ -31,9 +35,8 @@ def test_document_upload():
     try:
         # Upload document
         print("📤 Uploading test document...")
-        with open(test_file, 'rb') as f:
-            files = {'file': ('test_document.txt', f, 'text/plain')}
-            response = requests.post(f"{API_BASE}/api/documents/upload", files=files)
+        files = {'file': ('test_document.txt', test_file.read_bytes(), 'text/plain')}
+        response = await client.post(f"{API_BASE}/api/documents/upload", files=files)
         
         if response.status_code == 201:
             result = response.json()
@@ -44,7 +47,7 @@ def test_document_upload():
             
             # Test document retrieval
             print("\n📖 Retrieving document...")
-            doc_response = requests.get(f"{API_BASE}/api/documents/{doc_id}")
+            doc_response = await client.get(f"{API_BASE}/api/documents/{doc_id}")
             if doc_response.status_code == 200:
                 doc_data = doc_response.json()
                 print(f"✅ Document retrieved: {doc_data['title']}")
@@ -53,7 +56,7 @@ def test_document_upload():
             
             # Test chunks retrieval
             print("\n🧩 Retrieving chunks...")
-            chunks_response = requests.get(f"{API_BASE}/api/documents/{doc_id}/chunks")
+            chunks_response = await client.get(f"{API_BASE}/api/documents/{doc_id}/chunks")
             if chunks_response.status_code == 200:
                 chunks_data = chunks_response.json()
                 print(f"✅ Retrieved {len(chunks_data['chunks'])} chunks")
@@ -62,7 +65,7 @@ def test_document_upload():
             
             # Test document listing
             print("\n📋 Testing document listing...")
-            list_response = requests.get(f"{API_BASE}/api/documents/")
+            list_response = await client.get(f"{API_BASE}/api/documents/")
             if list_response.status_code == 200:
                 list_data = list_response.json()
                 print(f"✅ Listed {len(list_data['documents'])} documents")
@@ -79,10 +82,11 @@ def test_document_upload():
         if test_file.exists():
             test_file.unlink()
 
-def test_system_stats():
+async def test_system_stats():
     """Test system statistics"""
+    client = get_client()
     print("\n📊 Testing system statistics...")
-    response = requests.get(f"{API_BASE}/api/system/stats")
+    response = await client.get(f"{API_BASE}/api/system/stats")
     
     if response.status_code == 200:
         stats = response.json()
@@ -94,12 +98,13 @@ def test_system_stats():
     else:
         print(f"❌ Stats failed: {response.status_code}")
 
-def test_health_endpoints():
+async def test_health_endpoints():
     """Test health and basic endpoints"""
+    client = get_client()
     print("\n🏥 Testing health endpoints...")
     
     # Test health endpoint
-    health_response = requests.get(f"{API_BASE}/health")
+    health_response = await client.get(f"{API_BASE}/health")
     if health_response.status_code == 200:
         health_data = health_response.json()
         print(f"✅ Health check: {health_data['status']}")
@@ -108,13 +113,13 @@ def test_health_endpoints():
         print(f"❌ Health check failed: {health_response.status_code}")
     
     # Test basic stats endpoint
-    stats_response = requests.get(f"{API_BASE}/api/stats")
+    stats_response = await client.get(f"{API_BASE}/api/stats")
     if stats_response.status_code == 200:
         print("✅ Basic stats endpoint working")
     else:
         print(f"❌ Basic stats failed: {stats_response.status_code}")
 
-def test_pdf_upload():
+async def test_pdf_upload():
     """Test PDF upload (if available)"""
     print("\n📄 Testing PDF upload...")
     
@@ -125,22 +130,23 @@ def test_pdf_upload():
     print("   1. Place a PDF file in the scripts directory")
     print("   2. Update this function to use the actual file")
 
-if __name__ == "__main__":
+async def main():
+    """Run the pipeline tests over the shared API client"""
     print("🚀 Starting DocuMind Pipeline Tests")
     print("=" * 60)
     
     try:
         # Test basic endpoints first
-        test_health_endpoints()
+        await test_health_endpoints()
         
         # Test the main pipeline
-        doc_id = test_document_upload()
+        doc_id = await test_document_upload()
         
         # Test system statistics
-        test_system_stats()
+        await test_system_stats()
         
         # Test PDF functionality (placeholder)
-        test_pdf_upload()
+        await test_pdf_upload()
         
         if doc_id:
             print(f"\n🎉 All tests passed! Document ID: {doc_id}")
@@ -151,12 +157,17 @@ if __name__ == "__main__":
         else:
             print("\n❌ Some tests failed!")
             
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("\n❌ Connection Error!")
         print("   Make sure the DocuMind API server is running:")
         print("   cd backend && python -m app.main")
     except Exception as e:
         print(f"\n❌ Test error: {e}")
+    finally:
+        await close_client()
         
     print("\n" + "=" * 60)
     print("🏁 Test run completed")
+
+if __name__ == "__main__":
+    asyncio.run(main())
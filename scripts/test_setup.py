@@ -6,10 +6,19 @@ import sys
 import os
 import logging
 import asyncio
-import requests
+import functools
+import math
+import time
+import httpx
+import numpy as np
 from typing import Dict, Any, List
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add the backend directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
@@ -18,13 +27,84 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', 'backend', '.env'))
 
 from app.database.redis_client import redis_client
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_service import EmbeddingService, embedding_service as shared_embedding_service
 from app.services.search_service import SearchService
 from app.services.document_processor import DocumentProcessor
 
+from _http import get_client, close_client
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Backend files and settings the setup must provide (paths relative to backend/)
+_REQUIRED_FILES = frozenset({
+    'app/__init__.py',
+    'app/main.py',
+    'app/config.py',
+    'app/database/__init__.py',
+    'app/database/redis_client.py',
+    'app/database/models.py',
+    'app/api/__init__.py',
+    'app/api/documents.py',
+    'app/api/search.py',
+    'app/api/analytics.py',
+    'app/services/__init__.py',
+    'app/services/document_processor.py',
+    'app/services/embedding_service.py',
+    'app/services/search_service.py',
+    'app/utils/__init__.py',
+    'app/utils/file_handlers.py',
+    'app/utils/cache.py',
+    'requirements.txt',
+    '.env.example'
+})
+
+# Every directory on the way to a required file, so the walk can prune the rest
+_REQUIRED_DIRS = frozenset(
+    path.rsplit('/', depth)[0]
+    for path in _REQUIRED_FILES
+    for depth in range(1, path.count('/') + 1)
+)
+
+_REQUIRED_CONFIGS = (
+    'redis_host',
+    'redis_port',
+    'api_host',
+    'api_port',
+    'embedding_dimensions'
+)
+
+# Re-rank timing: how many seeded candidates to score (reported, not gated)
+RERANK_CANDIDATES = 10_000
+
+def get_embedding_service() -> EmbeddingService:
+    """The app's EmbeddingService singleton; providers are initialized once at import"""
+    return shared_embedding_service
+
+@functools.lru_cache(maxsize=1)
+def get_search_service() -> SearchService:
+    """One SearchService per run, sharing the embedding singleton"""
+    return SearchService(get_embedding_service())
+
+# Bulk embedding: this many synthetic texts with at most BULK_EMBED_CONCURRENCY in flight
+BULK_EMBED_TEXTS = 32
+BULK_EMBED_CONCURRENCY = 8
+
+async def _bulk_embed(service: EmbeddingService, texts: List[str], concurrency: int = BULK_EMBED_CONCURRENCY) -> List[Dict]:
+    """Embed texts one request each, keeping up to `concurrency` requests in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def embed_one(text: str) -> Dict:
+        async with semaphore:
+            return await service.generate_embedding(text)
+    
+    return await asyncio.gather(*(embed_one(text) for text in texts))
+
+@functools.lru_cache(maxsize=1)
+def _rerank_candidates(dimensions: int) -> np.ndarray:
+    """Seeded candidate matrix, built once per run"""
+    return np.random.default_rng(0).standard_normal((RERANK_CANDIDATES, dimensions)).astype(np.float32)
+
 class SetupTester:
     """Comprehensive setup testing for DocuMind"""
     
@@ -33,6 +113,17 @@ class SetupTester:
         self.test_results = {}
         self.failed_tests = []
         self.passed_tests = []
+        
+        # The pooled AsyncClient shared with the other API test scripts
+        self.http = get_client()
+        
+        # Services are built once and reused by every test
+        self.embedding_service = get_embedding_service()
+        self.search_service = get_search_service()
+    
+    async def close(self):
+        """Release pooled HTTP connections"""
+        await close_client()
     
     def test_redis_connection(self) -> bool:
         """Test Redis connection and basic operations"""
@@ -47,28 +138,26 @@ class SetupTester:
             # Test basic operations
             test_key = "test:setup_validation"
             test_value = "test_value_12345"
+            test_json = {"test": True, "timestamp": "2025-01-01"}
             
-            # SET operation
-            redis_client.client.set(test_key, test_value, ex=60)
+            # SET/GET, JSON round-trip (as set_json/get_json store it) and cleanup in one round-trip
+            pipe = redis_client.client.pipeline(transaction=False)
+            pipe.set(test_key, test_value, ex=60)
+            pipe.get(test_key)
+            pipe.set(f"{test_key}_json", json.dumps(test_json), ex=60)
+            pipe.get(f"{test_key}_json")
+            pipe.delete(test_key, f"{test_key}_json")
+            _, retrieved_value, _, retrieved_raw, _ = pipe.execute()
             
-            # GET operation
-            retrieved_value = redis_client.client.get(test_key)
             if retrieved_value != test_value:
                 self.failed_tests.append("Redis SET/GET operations failed")
                 return False
             
-            # JSON operations
-            test_json = {"test": True, "timestamp": "2025-01-01"}
-            redis_client.set_json(f"{test_key}_json", test_json, ttl=60)
-            retrieved_json = redis_client.get_json(f"{test_key}_json")
-            
+            retrieved_json = json.loads(retrieved_raw) if retrieved_raw else None
             if not retrieved_json or retrieved_json.get("test") != True:
                 self.failed_tests.append("Redis JSON operations failed")
                 return False
             
-            # Cleanup
-            redis_client.client.delete(test_key, f"{test_key}_json")
-            
             self.passed_tests.append("Redis connection and operations")
             return True
             
@@ -76,7 +165,7 @@ class SetupTester:
             self.failed_tests.append(f"Redis connection test failed: {e}")
             return False
     
-    def test_api_endpoints(self) -> bool:
+    async def test_api_endpoints(self) -> bool:
         """Test API endpoints availability and functionality"""
         try:
             logger.info("Testing API endpoints...")
@@ -85,25 +174,31 @@ class SetupTester:
                 ("/health", "GET"),
                 ("/api/stats", "GET"),
                 ("/api/test", "GET"),
-                ("/docs", "GET"),  # FastAPI docs
+                # FastAPI docs; only the status matters, so skip the Swagger HTML body.
+                # HEAD works here because /docs is a plain Starlette route - the API
+                # routes above answer HEAD with 405
+                ("/docs", "HEAD"),
             ]
             
+            # All probes in flight at once over the shared client
+            responses = await asyncio.gather(
+                *[self.http.request(method, f"{self.api_base_url}{endpoint}", timeout=10) for endpoint, method in endpoints_to_test],
+                return_exceptions=True
+            )
+            
             all_passed = True
             
-            for endpoint, method in endpoints_to_test:
-                try:
-                    if method == "GET":
-                        response = requests.get(f"{self.api_base_url}{endpoint}", timeout=10)
-                    
-                    if response.status_code not in [200, 307]:  # 307 for redirects
-                        self.failed_tests.append(f"API endpoint {endpoint} returned status {response.status_code}")
-                        all_passed = False
-                    else:
-                        logger.debug(f"✅ {endpoint}: {response.status_code}")
-                        
-                except requests.exceptions.RequestException as e:
-                    self.failed_tests.append(f"API endpoint {endpoint} failed: {e}")
+            for (endpoint, _), response in zip(endpoints_to_test, responses):
+                if isinstance(response, httpx.HTTPError):
+                    self.failed_tests.append(f"API endpoint {endpoint} failed: {response}")
                     all_passed = False
+                elif isinstance(response, Exception):
+                    raise response
+                elif response.status_code not in [200, 307]:  # 307 for redirects
+                    self.failed_tests.append(f"API endpoint {endpoint} returned status {response.status_code}")
+                    all_passed = False
+                else:
+                    logger.debug(f"✅ {endpoint}: {response.status_code}")
             
             if all_passed:
                 self.passed_tests.append("API endpoints accessibility")
@@ -119,13 +214,15 @@ class SetupTester:
         try:
             logger.info("Testing embedding service...")
             
-            embedding_service = EmbeddingService()
+            embedding_service = self.embedding_service
             
             # Test single embedding generation
             test_text = "This is a test document for embedding generation."
+            start = time.perf_counter()
             embedding = await embedding_service.generate_embedding(test_text)
+            single_seconds = time.perf_counter() - start
             
-            if not embedding or not isinstance(embedding, list) or len(embedding) == 0:
+            if not embedding or not isinstance(embedding.get("vector"), list) or len(embedding["vector"]) == 0:
                 self.failed_tests.append("Embedding generation failed")
                 return False
             
@@ -136,17 +233,62 @@ class SetupTester:
                 "Third test document"
             ]
             
-            batch_embeddings = await embedding_service.generate_embeddings_batch(test_texts)
+            batch_embeddings = await embedding_service.generate_batch_embeddings(test_texts)
             
             if not batch_embeddings or len(batch_embeddings) != len(test_texts):
                 self.failed_tests.append("Batch embedding generation failed")
                 return False
             
-            # Test similarity calculation
-            similarity = embedding_service.calculate_similarity(embedding, batch_embeddings[0])
+            # The vector index rejects anything but the configured dimensions
+            from app.config import settings
+            if len(batch_embeddings[0]["vector"]) != settings.embedding_dimensions:
+                self.failed_tests.append(
+                    f"Batch embedding has {len(batch_embeddings[0]['vector'])} dimensions, expected {settings.embedding_dimensions}"
+                )
+                return False
+            
+            # Windowed bulk embedding; distinct texts so the embedding cache can't answer
+            bulk_texts = [f"Synthetic throughput document {i} about topic {i % 7}" for i in range(BULK_EMBED_TEXTS)]
+            start = time.perf_counter()
+            bulk_embeddings = await _bulk_embed(embedding_service, bulk_texts)
+            bulk_seconds = time.perf_counter() - start
             
-            if not isinstance(similarity, (int, float)) or similarity < 0 or similarity > 1:
-                self.failed_tests.append("Similarity calculation failed")
+            if not all(result and result.get("vector") for result in bulk_embeddings):
+                self.failed_tests.append("Bulk embedding generation failed")
+                return False
+            
+            # Only API calls overlap; a local model shares one CPU-bound encoder
+            if embedding.get("method") == "openai":
+                waves = math.ceil(BULK_EMBED_TEXTS / BULK_EMBED_CONCURRENCY)
+                budget_seconds = 2 * waves * single_seconds
+                if bulk_seconds > budget_seconds:
+                    self.failed_tests.append(
+                        f"Bulk embedding of {BULK_EMBED_TEXTS} texts took {bulk_seconds:.2f}s "
+                        f"(budget {budget_seconds:.2f}s at concurrency {BULK_EMBED_CONCURRENCY})"
+                    )
+                    return False
+            
+            logger.info(f"Bulk embedded {BULK_EMBED_TEXTS} texts in {bulk_seconds:.2f}s (single request {single_seconds:.2f}s)")
+            
+            # Test similarity calculation, single pair and batched; numpy scalars count too
+            similarity = embedding_service.calculate_similarity(embedding["vector"], batch_embeddings[0]["vector"])
+            batch_similarity = embedding_service.calculate_similarity(
+                embedding["vector"],
+                np.asarray([result["vector"] for result in batch_embeddings], dtype=np.float32)
+            )
+            
+            for scores, expected_shape in ((similarity, ()), (batch_similarity, (len(test_texts),))):
+                scores = np.asarray(scores)
+                if scores.shape != expected_shape or not np.all((scores >= -1e-6) & (scores <= 1 + 1e-6)):
+                    self.failed_tests.append("Similarity calculation failed")
+                    return False
+            
+            # simsimd is a pinned requirement; falling back to NumPy means a broken install
+            similarity_backend = embedding_service.get_embedding_stats()["similarity_backend"]
+            if similarity_backend != "simsimd":
+                self.failed_tests.append(
+                    f"Similarity running on {similarity_backend}; install simsimd (see requirements.txt)"
+                )
                 return False
             
             self.passed_tests.append("Embedding service functionality")
@@ -206,8 +348,8 @@ class SetupTester:
         try:
             logger.info("Testing search functionality...")
             
-            search_service = SearchService()
-            embedding_service = EmbeddingService()
+            search_service = self.search_service
+            embedding_service = self.embedding_service
             
             # Create a test query embedding
             test_query = "machine learning algorithms"
@@ -219,7 +361,7 @@ class SetupTester:
             
             # Test search (may return empty results if no documents are indexed)
             search_results = await search_service.search_similar_documents(
-                query_embedding=query_embedding,
+                query_embedding=query_embedding["vector"],
                 limit=5,
                 threshold=0.5
             )
@@ -229,6 +371,17 @@ class SetupTester:
                 self.failed_tests.append("Search results format invalid")
                 return False
             
+            # Time the re-rank kernel on a realistic candidate count
+            query_vector = np.asarray(query_embedding["vector"], dtype=np.float32)
+            candidates = _rerank_candidates(len(query_vector))
+            start = time.perf_counter()
+            scores = embedding_service.calculate_similarity(query_vector, candidates)
+            np.flatnonzero(scores >= 0.5)
+            rerank_seconds = time.perf_counter() - start
+            
+            # Informational only: the other checks run concurrently, so wall time is noisy
+            logger.info(f"Re-ranked {RERANK_CANDIDATES} candidates in {rerank_seconds * 1000:.1f}ms")
+            
             # Test index stats
             index_stats = search_service.get_index_stats()
             
@@ -258,18 +411,7 @@ class SetupTester:
             from app.config import settings
             
             # Check required configuration
-            required_configs = [
-                'redis_host',
-                'redis_port', 
-                'api_host',
-                'api_port',
-                'embedding_dimensions'
-            ]
-            
-            missing_configs = []
-            for config in required_configs:
-                if not hasattr(settings, config):
-                    missing_configs.append(config)
+            missing_configs = [config for config in _REQUIRED_CONFIGS if not hasattr(settings, config)]
             
             if missing_configs:
                 self.failed_tests.append(f"Missing configurations: {missing_configs}")
@@ -294,33 +436,16 @@ class SetupTester:
             
             backend_path = os.path.join(os.path.dirname(__file__), '..', 'backend')
             
-            required_files = [
-                'app/__init__.py',
-                'app/main.py',
-                'app/config.py',
-                'app/database/__init__.py',
-                'app/database/redis_client.py',
-                'app/database/models.py',
-                'app/api/__init__.py',
-                'app/api/documents.py',
-                'app/api/search.py',
-                'app/api/analytics.py',
-                'app/services/__init__.py',
-                'app/services/document_processor.py',
-                'app/services/embedding_service.py',
-                'app/services/search_service.py',
-                'app/utils/__init__.py',
-                'app/utils/file_handlers.py',
-                'app/utils/cache.py',
-                'requirements.txt',
-                '.env.example'
-            ]
+            # One directory walk instead of a stat() per file; only descend into
+            # directories that hold required files (skips venvs, caches, etc.)
+            existing = set()
+            for root, dirs, files in os.walk(backend_path):
+                rel_root = os.path.relpath(root, backend_path).replace('\\', '/')
+                prefix = '' if rel_root == '.' else f"{rel_root}/"
+                dirs[:] = [d for d in dirs if f"{prefix}{d}" in _REQUIRED_DIRS]
+                existing.update(f"{prefix}{name}" for name in files)
             
-            missing_files = []
-            for file_path in required_files:
-                full_path = os.path.join(backend_path, file_path)
-                if not os.path.exists(full_path):
-                    missing_files.append(file_path)
+            missing_files = sorted(_REQUIRED_FILES - existing)
             
             if missing_files:
                 self.failed_tests.append(f"Missing files: {missing_files}")
@@ -357,32 +482,36 @@ class SetupTester:
             ("Search Functionality", self.test_search_functionality)
         ]
         
-        # Run tests
-        for test_name, test_func in tests:
-            try:
-                logger.info(f"Running: {test_name}")
-                
-                if asyncio.iscoroutinefunction(test_func):
-                    result = await test_func()
-                else:
-                    result = test_func()
-                
-                test_results["tests_run"] += 1
-                
-                if result:
-                    test_results["tests_passed"] += 1
-                    test_results["details"][test_name] = "PASSED"
-                    logger.info(f"✅ {test_name}: PASSED")
-                else:
-                    test_results["tests_failed"] += 1
-                    test_results["details"][test_name] = "FAILED"
-                    logger.error(f"❌ {test_name}: FAILED")
-                    
-            except Exception as e:
-                test_results["tests_run"] += 1
+        # The tests share no state beyond the passed/failed lists, so run them all at
+        # once: blocking ones in worker threads (list.append is atomic), async ones
+        # (including the API probes) on the loop. Wall time becomes the slowest test instead of the sum.
+        def start(test_name, test_func):
+            logger.info(f"Running: {test_name}")
+            if asyncio.iscoroutinefunction(test_func):
+                return test_func()
+            return asyncio.to_thread(test_func)
+        
+        outcomes = await asyncio.gather(
+            *[start(test_name, test_func) for test_name, test_func in tests],
+            return_exceptions=True
+        )
+        
+        # Tally in declaration order so the report is stable
+        for (test_name, _), result in zip(tests, outcomes):
+            test_results["tests_run"] += 1
+            
+            if isinstance(result, Exception):
                 test_results["tests_failed"] += 1
-                test_results["details"][test_name] = f"ERROR: {e}"
-                logger.error(f"❌ {test_name}: ERROR - {e}")
+                test_results["details"][test_name] = f"ERROR: {result}"
+                logger.error(f"❌ {test_name}: ERROR - {result}")
+            elif result:
+                test_results["tests_passed"] += 1
+                test_results["details"][test_name] = "PASSED"
+                logger.info(f"✅ {test_name}: PASSED")
+            else:
+                test_results["tests_failed"] += 1
+                test_results["details"][test_name] = "FAILED"
+                logger.error(f"❌ {test_name}: FAILED")
         
         # Calculate success rate
         if test_results["tests_run"] > 0:
@@ -392,31 +521,32 @@ class SetupTester:
         test_results["passed_tests"] = self.passed_tests
         test_results["failed_tests"] = self.failed_tests
         
+        await self.close()
         return test_results
     
     def print_test_summary(self, results: Dict[str, Any]):
         """Print formatted test results"""
-        print("\n📋 DocuMind Setup Test Results")
-        print("=" * 50)
+        # Built up and written once, so CI log streamers see a single write
+        lines = ["\n📋 DocuMind Setup Test Results", "=" * 50]
         
-        print(f"\nTests Run: {results['tests_run']}")
-        print(f"Tests Passed: {results['tests_passed']}")
-        print(f"Tests Failed: {results['tests_failed']}")
-        print(f"Success Rate: {results['success_rate']*100:.1f}%")
+        lines.append(f"\nTests Run: {results['tests_run']}")
+        lines.append(f"Tests Passed: {results['tests_passed']}")
+        lines.append(f"Tests Failed: {results['tests_failed']}")
+        lines.append(f"Success Rate: {results['success_rate']*100:.1f}%")
         
-        print(f"\n✅ Passed Tests:")
-        for test in results.get('passed_tests', []):
-            print(f"  - {test}")
+        lines.append(f"\n✅ Passed Tests:")
+        lines.extend(f"  - {test}" for test in results.get('passed_tests', []))
         
         if results.get('failed_tests'):
-            print(f"\n❌ Failed Tests:")
-            for test in results['failed_tests']:
-                print(f"  - {test}")
+            lines.append(f"\n❌ Failed Tests:")
+            lines.extend(f"  - {test}" for test in results['failed_tests'])
         
-        print(f"\n📊 Detailed Results:")
+        lines.append(f"\n📊 Detailed Results:")
         for test_name, status in results['details'].items():
             status_icon = "✅" if status == "PASSED" else "❌"
-            print(f"  {status_icon} {test_name}: {status}")
+            lines.append(f"  {status_icon} {test_name}: {status}")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
 
 async def main():
     """Main test function"""
@@ -435,8 +565,12 @@ async def main():
     # Save results
     try:
         results_file = "setup_test_results.json"
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        if orjson is not None:
+            with open(results_file, 'wb') as f:
+                f.write(orjson.dumps(results, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(results_file, 'w') as f:
+                json.dump(results, f, indent=2, default=str)
         print(f"\n💾 Test results saved to: {results_file}")
     except Exception as e:
         logger.warning(f"Failed to save test results: {e}")
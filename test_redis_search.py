@@ -2,14 +2,9 @@
 """
 Test Redis Stack search specifically to isolate the UTF-8 decode error
 """
-import sys
-import os
 import numpy as np
 import asyncio
 
-# Add backend to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
-
 async def test_redis_search_directly():
     """Test Redis Stack search directly to isolate the UTF-8 error"""
     print("🔍 Testing Redis Stack Search Directly")
@@ -46,12 +41,12 @@ async def test_redis_search_directly():
         
         print(f"\n🔍 Testing Redis Stack Search:")
         
+        # Build query exactly like our code; only the vector param differs per format
+        q = Query(f"*=>[KNN {limit} @vector $vector AS vector_score]").dialect(2)
+        
         for method_name, vector_bytes in [("numpy", numpy_bytes), ("struct", struct_bytes)]:
             print(f"\nTesting {method_name} format:")
             try:
-                # Build query exactly like our code
-                q = Query(f"*=>[KNN {limit} @vector $vector AS vector_score]").dialect(2)
-                
                 print(f"  Query: {q}")
                 print(f"  Vector bytes length: {len(vector_bytes)}")
                 print(f"  First 10 bytes: {vector_bytes[:10]}")